@@ -6,24 +6,35 @@ Fetches project data from the HOT Tasking Manager API, transforms it into
 cloud-native formats, and uploads to S3 (or S3-compatible storage like Source.coop).
 """
 
+import contextlib
+import functools
 import gzip
-import json
+import hashlib
+import io
 import logging
+import math
 import os
 import re
 import subprocess
 import sys
 import tempfile
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
 import boto3
+import orjson
 import requests
+import shapely
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 from botocore.exceptions import ClientError
 from pyproj import Geod
+from requests.adapters import HTTPAdapter
 from shapely.geometry import shape
+from urllib3.util.retry import Retry
 
 # Configure logging
 logging.basicConfig(
@@ -43,8 +54,20 @@ PMTILES_OUTPUT = "projects.pmtiles"
 PROJECTS_SUMMARY = "projects_summary.json"
 STATE_SCHEMA_VERSION = 3
 STATE_CHECKPOINT_INTERVAL = 100
+STATE_SAVE_ATTEMPTS = 3
 DISCOVERY_OVERLAP_DAYS = 1
 FULL_DISCOVERY_INTERVAL_DAYS = 14
+PROJECT_FETCH_WORKERS = 16
+REFRESH_FETCH_WORKERS = 32
+PAGE_FETCH_WORKERS = 8
+HTTP_POOL_SIZE = 32
+S3_POOL_SIZE = 64
+MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024
+MULTIPART_CONCURRENCY = 16
+# Projects whose details are held before their aggregate features are built
+FEATURE_BATCH_SIZE = 500
+# Level 6 compresses GeoJSON nearly as well as the default 9 in a fraction of the time
+GZIP_COMPRESS_LEVEL = 6
 
 # Geodesic calculator for area computation
 GEOD = Geod(ellps="WGS84")
@@ -65,40 +88,60 @@ def normalize_imagery(raw: str | None) -> str:
     if not raw or raw.strip() == "":
         return "Not specified"
 
-    raw_stripped = raw.strip()
+    return _classify_imagery(raw.strip())
 
+
+@functools.lru_cache(maxsize=4096)
+def _classify_imagery(raw_stripped: str) -> str:
+    """Classify a non-empty imagery value; memoized since projects share a few values."""
     for pattern, category in IMAGERY_PATTERNS:
         if pattern.search(raw_stripped):
             return category
 
-    # If it looks like a URL or TMS spec but doesn't match known patterns
-    if raw_stripped.startswith(("http://", "https://", "tms[")):
-        return "Other"
-
+    # URLs, TMS specs and anything else unrecognized
     return "Other"
 
 
-def compute_area_sqkm(geojson_geometry: dict) -> float | None:
-    """Compute geodesic area in square kilometers from a GeoJSON geometry."""
-    try:
-        geom = shape(geojson_geometry)
-        # Geod.geometry_area_perimeter returns (area, perimeter) in sq meters
-        area_sqm, _ = GEOD.geometry_area_perimeter(geom)
-        return round(abs(area_sqm) / 1_000_000, 2)  # Convert to sq km
-    except Exception as e:
-        logger.debug(f"Area computation failed: {e}")
-        return None
+def compute_geometry_metrics(
+    geojson_geometries: list[dict | None],
+) -> list[tuple[float | None, tuple[float, float] | None]]:
+    """Compute geodesic area (sq km) and centroid (lon, lat) for a batch of GeoJSON geometries.
 
+    Each geometry is constructed once and centroids come from a single
+    vectorized Shapely call. Area is still computed per geometry because pyproj
+    has no batch polygon-area API.
+    """
+    geoms = []
+    for geojson_geometry in geojson_geometries:
+        try:
+            geoms.append(shape(geojson_geometry))
+        except Exception as e:
+            logger.debug("Geometry construction failed: %s", e)
+            geoms.append(None)
+
+    centroids = shapely.centroid(geoms)
+    # Empty AOIs have an empty centroid, which get_x/get_y reject for the whole batch
+    centroids[shapely.is_empty(centroids)] = None
+    lons = shapely.get_x(centroids)
+    lats = shapely.get_y(centroids)
+
+    metrics = []
+    for geom, lon, lat in zip(geoms, lons, lats):
+        area_sqkm = None
+        if geom is not None:
+            try:
+                # Geod.geometry_area_perimeter returns (area, perimeter) in sq meters
+                area_sqm, _ = GEOD.geometry_area_perimeter(geom)
+                area_sqkm = round(abs(area_sqm) / 1_000_000, 2)  # Convert to sq km
+            except Exception as e:
+                logger.debug("Area computation failed: %s", e)
 
-def compute_centroid(geojson_geometry: dict) -> tuple[float, float] | None:
-    """Compute centroid [lon, lat] from a GeoJSON geometry."""
-    try:
-        geom = shape(geojson_geometry)
-        centroid = geom.centroid
-        return (round(centroid.x, 4), round(centroid.y, 4))
-    except Exception as e:
-        logger.debug(f"Centroid computation failed: {e}")
-        return None
+        centroid = None
+        if not (math.isnan(lon) or math.isnan(lat)):
+            centroid = (round(float(lon), 4), round(float(lat), 4))
+
+        metrics.append((area_sqkm, centroid))
+    return metrics
 
 
 def parse_iso8601_timestamp(value: str | None) -> datetime | None:
@@ -134,8 +177,31 @@ def normalize_api_timestamp(value: str | None) -> str | None:
     return normalized.isoformat(timespec="milliseconds").replace("+00:00", "Z")
 
 
+def iter_completed(
+    func: Callable[[Any], Any], items: Iterable[Any], max_workers: int
+) -> Iterator[tuple[Any, Future]]:
+    """Run func over items in a thread pool, yielding (item, future) as each finishes.
+
+    Pending calls are cancelled when the generator is closed. Callers should
+    wrap it in contextlib.closing() so that also happens when their loop body
+    raises; otherwise the suspended generator is never finalized and the pool
+    drains the whole queue.
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {executor.submit(func, item): item for item in items}
+        for future in as_completed(futures):
+            yield futures[future], future
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
 class S3Client:
-    """S3 client wrapper that supports custom endpoints for S3-compatible storage."""
+    """S3 client wrapper that supports custom endpoints for S3-compatible storage.
+
+    One instance is shared by all worker threads; the underlying boto3 client
+    is thread-safe and its connection pool is sized for that.
+    """
 
     def __init__(self):
         self.bucket_name = os.environ["AWS_BUCKET_NAME"]
@@ -144,7 +210,7 @@ class S3Client:
         # Auto-detect Cloudflare R2 and use 'auto' region
         if endpoint_url and "cloudflarestorage.com" in endpoint_url:
             self.region = "auto"
-            logger.info(f"Using Cloudflare R2 endpoint: {endpoint_url}")
+            logger.info("Using Cloudflare R2 endpoint: %s", endpoint_url)
         else:
             self.region = os.environ.get("AWS_REGION", "us-east-1")
 
@@ -158,20 +224,40 @@ class S3Client:
                 signature_version="s3v4",
                 request_checksum_calculation="when_required",
                 response_checksum_validation="when_required",
+                # Worker threads share this client; keep enough pooled
+                # connections that concurrent uploads don't queue.
+                max_pool_connections=S3_POOL_SIZE,
+                # Adaptive retries back off client-wide on throttling (503
+                # SlowDown) instead of every thread retrying in lockstep.
+                retries={"mode": "adaptive", "max_attempts": 10},
+                tcp_keepalive=True,
+                connect_timeout=5,
+                read_timeout=120,
             ),
         }
 
         if endpoint_url:
             client_kwargs["endpoint_url"] = endpoint_url
             if "cloudflarestorage.com" not in endpoint_url:
-                logger.info(f"Using custom S3 endpoint: {endpoint_url}")
+                logger.info("Using custom S3 endpoint: %s", endpoint_url)
         else:
             logger.info("Using standard AWS S3")
 
         self.client = boto3.client(**client_kwargs)
+        self._transfer_config = TransferConfig(
+            multipart_threshold=MULTIPART_CHUNK_SIZE,
+            multipart_chunksize=MULTIPART_CHUNK_SIZE,
+            max_concurrency=MULTIPART_CONCURRENCY,
+            use_threads=True,
+        )
 
     def get_object(self, key: str) -> bytes | None:
         """Get an object from S3, returns None if not found."""
+        data, _ = self.get_object_with_etag(key)
+        return data
+
+    def get_object_with_etag(self, key: str) -> tuple[bytes | None, str | None]:
+        """Get an object and its ETag from S3, returns (None, None) if not found."""
         try:
             response = self.client.get_object(Bucket=self.bucket_name, Key=key)
             data = response["Body"].read()
@@ -179,11 +265,11 @@ class S3Client:
             content_encoding = response.get("ContentEncoding", "")
             if content_encoding == "gzip":
                 data = gzip.decompress(data)
-            return data
+            return data, response.get("ETag")
         except ClientError as e:
             error_code = e.response.get("Error", {}).get("Code")
             if error_code in {"404", "NoSuchKey", "NotFound"}:
-                return None
+                return None, None
             raise
 
     def put_object(
@@ -193,23 +279,70 @@ class S3Client:
         content_type: str,
         cache_control: str | None = None,
         compress: bool = False,
-    ) -> None:
-        """Upload an object to S3 with specified content type."""
-        kwargs: dict[str, Any] = {
-            "Bucket": self.bucket_name,
-            "Key": key,
-            "Body": body,
-            "ContentType": content_type,
-        }
+        if_match: str | None = None,
+        if_none_match: str | None = None,
+    ) -> str | None:
+        """Upload an object to S3 with specified content type.
+
+        Bodies at or above the multipart threshold go through the managed
+        transfer so their parts upload concurrently. With if_match, the write
+        only succeeds if the stored object still has that ETag; with
+        if_none_match="*", only if no object exists yet. Conditional writes
+        always use a single PutObject so the new ETag can be returned.
+        """
+        extra_args: dict[str, Any] = {"ContentType": content_type}
         if cache_control:
-            kwargs["CacheControl"] = cache_control
+            extra_args["CacheControl"] = cache_control
         if compress:
-            kwargs["Body"] = gzip.compress(body)
-            kwargs["ContentEncoding"] = "gzip"
+            body = gzip.compress(body, compresslevel=GZIP_COMPRESS_LEVEL)
+            extra_args["ContentEncoding"] = "gzip"
+
+        conditional = if_match is not None or if_none_match is not None
+        etag = None
+        if len(body) >= MULTIPART_CHUNK_SIZE and not conditional:
+            self.client.upload_fileobj(
+                io.BytesIO(body),
+                Bucket=self.bucket_name,
+                Key=key,
+                ExtraArgs=extra_args,
+                Config=self._transfer_config,
+            )
+        else:
+            if if_match is not None:
+                extra_args["IfMatch"] = if_match
+            if if_none_match is not None:
+                extra_args["IfNoneMatch"] = if_none_match
+            response = self.client.put_object(
+                Bucket=self.bucket_name, Key=key, Body=body, **extra_args
+            )
+            etag = response.get("ETag")
+        logger.debug(
+            "Uploaded: %s (%s, %.0f KB)", key, content_type, len(body) / 1024
+        )
+        return etag
 
-        self.client.put_object(**kwargs)
-        size_kb = len(kwargs["Body"]) / 1024
-        logger.debug(f"Uploaded: {key} ({content_type}, {size_kb:.0f} KB)")
+    def upload_file(
+        self,
+        key: str,
+        path: Path,
+        content_type: str,
+        cache_control: str | None = None,
+    ) -> None:
+        """Stream a local file to S3, using concurrent multipart upload for large files."""
+        extra_args = {"ContentType": content_type}
+        if cache_control:
+            extra_args["CacheControl"] = cache_control
+
+        self.client.upload_file(
+            Filename=str(path),
+            Bucket=self.bucket_name,
+            Key=key,
+            ExtraArgs=extra_args,
+            Config=self._transfer_config,
+        )
+        logger.debug(
+            "Uploaded: %s (%s, %.0f KB)", key, content_type, path.stat().st_size / 1024
+        )
 
     def delete_objects(self, keys: list[str]) -> int:
         """Delete objects from R2/S3. Returns the number successfully deleted."""
@@ -229,14 +362,12 @@ class S3Client:
                 logger.warning("Failed to delete %s: %s", err["Key"], err["Message"])
         return deleted
 
-    def list_objects(self, prefix: str) -> list[str]:
-        """List all object keys with a given prefix."""
-        keys = []
+    def list_objects(self, prefix: str) -> Iterator[str]:
+        """Yield all object keys with a given prefix, one listing page at a time."""
         paginator = self.client.get_paginator("list_objects_v2")
         for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
             for obj in page.get("Contents", []):
-                keys.append(obj["Key"])
-        return keys
+                yield obj["Key"]
 
 
 class HOTApiClient:
@@ -250,6 +381,49 @@ class HOTApiClient:
                 "User-Agent": "HOT-TM-CloudNativeMirror/1.0",
             }
         )
+        # Size the connection pool for concurrent detail fetches; the default
+        # of 10 would make worker threads discard and reopen connections.
+        # Transient errors and rate limiting are retried with backoff at the
+        # transport level; the final response is still returned so callers'
+        # raise_for_status() handling is unchanged.
+        retry = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE,
+            pool_maxsize=HTTP_POOL_SIZE,
+            max_retries=retry,
+        )
+        self.session.mount("https://", adapter)
+
+    def _get_projects_page(self, params: dict[str, Any], page: int) -> dict[str, Any]:
+        """Fetch a single page of the project list."""
+        response = self.session.get(
+            PROJECTS_ENDPOINT, params={**params, "page": page}, timeout=60
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+    @staticmethod
+    def _skip_failed_page(error: requests.HTTPError, page: int) -> bool:
+        """Log a failed page fetch and return whether pagination should move past it."""
+        status_code = error.response.status_code
+        if status_code == 400:
+            logger.warning(
+                "API returned 400 at page %s (likely bad data on page). Skipping page.",
+                page,
+            )
+            return True
+
+        logger.warning(
+            "API returned %s at page %s, stopping pagination",
+            status_code,
+            page,
+        )
+        return False
 
     def _paginate_projects(
         self,
@@ -257,60 +431,65 @@ class HOTApiClient:
         last_updated_to: str | None = None,
         order_by: str = "last_updated",
     ) -> list[dict[str, Any]]:
-        """Paginate through project list pages with the given filters."""
+        """Paginate through project list pages with the given filters.
+
+        Pages are read one at a time until one reports the total page count;
+        the remaining pages are then fetched concurrently and applied in order.
+        """
+        params = {
+            "orderBy": order_by,
+            "orderByType": "DESC",
+            "projectStatuses": "PUBLISHED,ARCHIVED",
+            "omitMapResults": "true",
+        }
+        if last_updated_from:
+            params["lastUpdatedFrom"] = last_updated_from
+        if last_updated_to:
+            params["lastUpdatedTo"] = last_updated_to
+
         all_projects = []
         page = 1
         total_pages = None
-        while True:
-            params = {
-                "orderBy": order_by,
-                "orderByType": "DESC",
-                "projectStatuses": "PUBLISHED,ARCHIVED",
-                "omitMapResults": "true",
-                "page": page,
-            }
-            if last_updated_from:
-                params["lastUpdatedFrom"] = last_updated_from
-            if last_updated_to:
-                params["lastUpdatedTo"] = last_updated_to
-
+        while total_pages is None:
             try:
-                response = self.session.get(
-                    PROJECTS_ENDPOINT, params=params, timeout=60
-                )
-                response.raise_for_status()
-                data = response.json()
+                data = self._get_projects_page(params, page)
             except requests.HTTPError as e:
-                status_code = e.response.status_code
-                if status_code == 400:
-                    logger.warning(
-                        "API returned 400 at page %s (likely bad data on page). Skipping page.",
-                        page,
-                    )
-                    if total_pages is not None and page >= total_pages:
-                        break
-                    page += 1
-                    continue
-                else:
-                    logger.warning(
-                        "API returned %s at page %s, stopping pagination",
-                        status_code,
-                        page,
-                    )
-                    break
+                if not self._skip_failed_page(e, page):
+                    return all_projects
+                page += 1
+                continue
 
             results = data.get("results", [])
             if not results:
-                break
+                return all_projects
 
             all_projects.extend(results)
-            pagination = data.get("pagination", {})
-            total_pages = pagination.get("pages", 1)
+            total_pages = data.get("pagination", {}).get("pages", 1)
 
-            if page >= total_pages:
-                break
+        remaining_pages = range(page + 1, total_pages + 1)
+        executor = ThreadPoolExecutor(max_workers=PAGE_FETCH_WORKERS)
+        try:
+            futures = [
+                executor.submit(self._get_projects_page, params, remaining_page)
+                for remaining_page in remaining_pages
+            ]
+            for remaining_page, future in zip(remaining_pages, futures):
+                try:
+                    data = future.result()
+                except requests.HTTPError as e:
+                    if self._skip_failed_page(e, remaining_page):
+                        continue
+                    break
+
+                results = data.get("results", [])
+                if not results:
+                    break
 
-            page += 1
+                all_projects.extend(results)
+        finally:
+            # If pagination stopped early or raised, don't fetch pages that
+            # would be discarded
+            executor.shutdown(wait=True, cancel_futures=True)
 
         return all_projects
 
@@ -379,7 +558,8 @@ class HOTApiClient:
         url = f"{HOT_API_BASE}/projects/{project_id}/"
         response = self.session.get(url, timeout=60)
         response.raise_for_status()
-        return response.json()
+        # Decode the UTF-8 body directly; details carry large AOI coordinate arrays
+        return orjson.loads(response.content)
 
 
 class StateManager:
@@ -391,6 +571,8 @@ class StateManager:
         self.aggregate_dirty = False
         self.last_aggregate_build_at: str | None = None
         self.last_full_discovery_at: str | None = None
+        self._saved_digest: str | None = None
+        self._etag: str | None = None
 
     @staticmethod
     def _is_legacy_state(payload: Any) -> bool:
@@ -399,14 +581,19 @@ class StateManager:
 
     def load(self) -> None:
         """Load state from S3 or reconstruct from existing files."""
-        data = self.s3_client.get_object(STATE_FILE_KEY)
+        data, self._etag = self.s3_client.get_object_with_etag(STATE_FILE_KEY)
         source_key = STATE_FILE_KEY if data else None
         if not data:
             data = self.s3_client.get_object(LEGACY_STATE_FILE_KEY)
             source_key = LEGACY_STATE_FILE_KEY if data else None
 
+        # Remember what is already stored so save() can skip identical rewrites
+        self._saved_digest = (
+            hashlib.blake2b(data).hexdigest() if source_key == STATE_FILE_KEY else None
+        )
+
         if data:
-            payload = json.loads(data.decode("utf-8"))
+            payload = orjson.loads(data)
             if not isinstance(payload, dict):
                 raise ValueError("State file must decode to a JSON object")
 
@@ -426,30 +613,7 @@ class StateManager:
                 )
                 return
 
-            projects = payload.get("projects", {})
-            if not isinstance(projects, dict):
-                raise ValueError("State file is missing a valid 'projects' mapping")
-
-            self.project_timestamps = {
-                str(k): normalized
-                for k, v in projects.items()
-                if (normalized := normalize_api_timestamp(v)) is not None
-            }
-            self.aggregate_dirty = bool(payload.get("aggregateDirty", False))
-
-            last_aggregate_build_at = payload.get("lastAggregateBuildAt")
-            self.last_aggregate_build_at = (
-                last_aggregate_build_at
-                if isinstance(last_aggregate_build_at, str)
-                else None
-            )
-            last_full_discovery_at = payload.get("lastFullDiscoveryAt")
-            self.last_full_discovery_at = (
-                last_full_discovery_at
-                if isinstance(last_full_discovery_at, str)
-                else None
-            )
-
+            self._apply_payload(payload)
             logger.info(
                 "Loaded state from %s with %s projects (aggregate dirty: %s, last full discovery: %s)",
                 source_key,
@@ -468,8 +632,72 @@ class StateManager:
             self.last_aggregate_build_at = None
             self.last_full_discovery_at = None
 
-    def save(self) -> None:
-        """Save state to S3."""
+    def _apply_payload(self, payload: dict[str, Any]) -> None:
+        """Populate state from a current-schema state payload."""
+        projects = payload.get("projects", {})
+        if not isinstance(projects, dict):
+            raise ValueError("State file is missing a valid 'projects' mapping")
+
+        self.project_timestamps = {
+            str(k): normalized
+            for k, v in projects.items()
+            if (normalized := normalize_api_timestamp(v)) is not None
+        }
+        self.aggregate_dirty = bool(payload.get("aggregateDirty", False))
+
+        last_aggregate_build_at = payload.get("lastAggregateBuildAt")
+        self.last_aggregate_build_at = (
+            last_aggregate_build_at
+            if isinstance(last_aggregate_build_at, str)
+            else None
+        )
+        last_full_discovery_at = payload.get("lastFullDiscoveryAt")
+        self.last_full_discovery_at = (
+            last_full_discovery_at
+            if isinstance(last_full_discovery_at, str)
+            else None
+        )
+
+    def _merge_stored_state(self) -> None:
+        """Fold in a state file written concurrently by another run.
+
+        Keeps the newest timestamp per project, so neither run's uploads are
+        forgotten and re-fetched next time. Projects one run removed may be
+        re-added; the next full discovery prunes them again.
+        """
+        data, self._etag = self.s3_client.get_object_with_etag(STATE_FILE_KEY)
+        self._saved_digest = None
+        if not data:
+            return
+
+        payload = orjson.loads(data)
+        if not isinstance(payload, dict) or self._is_legacy_state(payload):
+            raise ValueError(f"Unexpected state format in {STATE_FILE_KEY}")
+
+        stored = StateManager(self.s3_client)
+        stored._apply_payload(payload)
+        for project_id, stored_timestamp in stored.project_timestamps.items():
+            current = self.project_timestamps.get(project_id)
+            if current is None or stored_timestamp > current:
+                self.project_timestamps[project_id] = stored_timestamp
+        self.aggregate_dirty = self.aggregate_dirty or stored.aggregate_dirty
+        # Both fields are fixed-format UTC timestamps, so string order is time order
+        self.last_aggregate_build_at = max(
+            filter(None, [self.last_aggregate_build_at, stored.last_aggregate_build_at]),
+            default=None,
+        )
+        self.last_full_discovery_at = max(
+            filter(None, [self.last_full_discovery_at, stored.last_full_discovery_at]),
+            default=None,
+        )
+        logger.warning(
+            "%s changed since it was loaded; merged %s stored projects before retrying",
+            STATE_FILE_KEY,
+            len(stored.project_timestamps),
+        )
+
+    def _build_payload(self) -> dict[str, Any]:
+        """Build the current-schema state payload."""
         payload: dict[str, Any] = {
             "version": STATE_SCHEMA_VERSION,
             "projects": self.project_timestamps,
@@ -479,12 +707,44 @@ class StateManager:
             payload["lastAggregateBuildAt"] = self.last_aggregate_build_at
         if self.last_full_discovery_at:
             payload["lastFullDiscoveryAt"] = self.last_full_discovery_at
+        return payload
+
+    def save(self) -> None:
+        """Save state to S3, skipping the upload if it matches what is already stored.
+
+        Writes are conditional on the ETag seen at load time (or on the file
+        not existing yet); if another run has written it since, its state is
+        merged in and the write retried.
+        """
+        for attempt in range(1, STATE_SAVE_ATTEMPTS + 1):
+            body = orjson.dumps(self._build_payload(), option=orjson.OPT_SORT_KEYS)
+            digest = hashlib.blake2b(body).hexdigest()
+            if digest == self._saved_digest:
+                logger.info("State unchanged, skipping upload of %s", STATE_FILE_KEY)
+                return
+
+            # Without a known ETag, only create the file if no other run has yet
+            try:
+                if self._etag:
+                    condition = {"if_match": self._etag}
+                else:
+                    condition = {"if_none_match": "*"}
+                self._etag = self.s3_client.put_object(
+                    STATE_FILE_KEY, body, "application/json", **condition
+                )
+            except ClientError as e:
+                error_code = e.response.get("Error", {}).get("Code")
+                if (
+                    error_code not in {"PreconditionFailed", "ConditionalRequestConflict"}
+                    or attempt == STATE_SAVE_ATTEMPTS
+                ):
+                    raise
+                self._merge_stored_state()
+                continue
+
+            self._saved_digest = digest
+            break
 
-        self.s3_client.put_object(
-            STATE_FILE_KEY,
-            json.dumps(payload, indent=2, sort_keys=True).encode("utf-8"),
-            "application/json",
-        )
         logger.info(
             "Saved state to %s with %s projects (aggregate dirty: %s, last full discovery: %s)",
             STATE_FILE_KEY,
@@ -617,7 +877,11 @@ def build_lean_project(details: dict[str, Any]) -> dict[str, Any]:
     return lean
 
 
-def build_feature(details: dict[str, Any]) -> dict[str, Any] | None:
+def build_feature(
+    details: dict[str, Any],
+    area_sqkm: float | None,
+    centroid: tuple[float, float] | None,
+) -> dict[str, Any] | None:
     """Build a GeoJSON feature from project details with enriched properties."""
     project_id = details.get("projectId")
     aoi = details.get("areaOfInterest")
@@ -628,9 +892,6 @@ def build_feature(details: dict[str, Any]) -> dict[str, Any] | None:
     country_tag = details.get("countryTag", []) or []
     project_info = details.get("projectInfo", {}) or {}
 
-    area_sqkm = compute_area_sqkm(aoi)
-    centroid = compute_centroid(aoi)
-
     return {
         "type": "Feature",
         "geometry": aoi,
@@ -655,6 +916,34 @@ def build_feature(details: dict[str, Any]) -> dict[str, Any] | None:
     }
 
 
+def build_features(details_list: list[dict[str, Any]]) -> list[dict[str, Any] | None]:
+    """Build GeoJSON features for a batch of projects, computing geometry metrics together."""
+    metrics = compute_geometry_metrics(
+        [details.get("areaOfInterest") for details in details_list]
+    )
+    return [
+        build_feature(details, area_sqkm, centroid)
+        for details, (area_sqkm, centroid) in zip(details_list, metrics)
+    ]
+
+
+def apply_features(
+    feature_map: dict[int, dict[str, Any]], details_by_id: dict[int, dict[str, Any]]
+) -> None:
+    """Build features for a batch of project details into feature_map, then drop the details.
+
+    Full project details (task grids included) are no longer needed once their
+    feature is built, so callers can flush in batches to bound memory.
+    """
+    features = build_features(list(details_by_id.values()))
+    for project_id, feature in zip(details_by_id, features):
+        if feature:
+            feature_map[project_id] = feature
+        else:
+            feature_map.pop(project_id, None)
+    details_by_id.clear()
+
+
 def build_summary_entry(feature: dict[str, Any]) -> dict[str, Any]:
     """Build a lightweight summary entry from a GeoJSON feature (no geometry)."""
     props = feature["properties"]
@@ -680,6 +969,13 @@ def build_summary_entry(feature: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+def encode_feature_collection(feature_lines: list[bytes]) -> bytes:
+    """Wrap pre-serialized features in a compact GeoJSON FeatureCollection."""
+    return b"".join(
+        [b'{"type":"FeatureCollection","features":[', b",".join(feature_lines), b"]}"]
+    )
+
+
 def load_cached_feature_map(s3_client: S3Client) -> dict[int, dict[str, Any]]:
     """Load cached aggregate features keyed by project ID."""
     cached = s3_client.get_object(ALL_PROJECTS_GEOJSON)
@@ -687,7 +983,7 @@ def load_cached_feature_map(s3_client: S3Client) -> dict[int, dict[str, Any]]:
         logger.info("No cached aggregate GeoJSON found; full rebuild required")
         return {}
 
-    payload = json.loads(cached.decode("utf-8"))
+    payload = orjson.loads(cached)
     features = payload.get("features")
     if payload.get("type") != "FeatureCollection" or not isinstance(features, list):
         raise ValueError("Cached aggregate GeoJSON is not a valid FeatureCollection")
@@ -712,6 +1008,23 @@ def load_cached_feature_map(s3_client: S3Client) -> dict[int, dict[str, Any]]:
     return feature_map
 
 
+def fetch_and_upload_project(
+    s3_client: S3Client, api_client: HOTApiClient, project_id: int
+) -> dict[str, Any]:
+    """Fetch project details from the API and upload the lean project JSON."""
+    details = api_client.get_project_details(project_id)
+
+    # Upload lean project JSON (only consumer-needed fields)
+    lean = build_lean_project(details)
+    s3_client.put_object(
+        f"api/v2/projects/{project_id}",
+        orjson.dumps(lean),
+        "application/json",
+        cache_control="public, max-age=3600",
+    )
+    return details
+
+
 def get_project_details_for_rebuild(
     s3_client: S3Client,
     api_client: HOTApiClient,
@@ -725,7 +1038,7 @@ def get_project_details_for_rebuild(
 
     cached = s3_client.get_object(f"api/v2/projects/{project_id}")
     if cached:
-        cached_details = json.loads(cached.decode("utf-8"))
+        cached_details = orjson.loads(cached)
         if (
             not expected_last_updated
             or normalize_api_timestamp(cached_details.get("lastUpdated"))
@@ -736,8 +1049,8 @@ def get_project_details_for_rebuild(
     return api_client.get_project_details(project_id)
 
 
-def generate_pmtiles(geojson_path: Path, output_path: Path) -> bool:
-    """Generate PMTiles from GeoJSON using tippecanoe."""
+def generate_pmtiles(feature_lines: list[bytes], output_path: Path) -> bool:
+    """Generate PMTiles by piping newline-delimited GeoJSON features into tippecanoe."""
     logger.info("Generating PMTiles with tippecanoe...")
 
     cmd = [
@@ -758,16 +1071,41 @@ def generate_pmtiles(geojson_path: Path, output_path: Path) -> bool:
         "-y", "percentValidated",
         "-y", "areaSqKm",
         "-y", "difficulty",
-        str(geojson_path),
+        # Parse the line-delimited features on several threads
+        "--read-parallel",
+        # No input file: tippecanoe reads GeoJSON from stdin
     ]
 
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        # stderr goes to a file rather than a pipe so tippecanoe's progress
+        # output can't fill the pipe and stall while we are still writing stdin.
+        with tempfile.TemporaryFile() as stderr_file:
+            process = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=stderr_file,
+            )
+            try:
+                # Stream line by line so tippecanoe parses while we write
+                for line in feature_lines:
+                    process.stdin.write(line)
+                    process.stdin.write(b"\n")
+            except BrokenPipeError:
+                # tippecanoe exited early; its exit status and stderr say why
+                pass
+            finally:
+                with contextlib.suppress(BrokenPipeError):
+                    process.stdin.close()
+
+            if process.wait() != 0:
+                stderr_file.seek(0)
+                stderr = stderr_file.read().decode("utf-8", errors="replace")
+                logger.error("tippecanoe failed: %s", stderr)
+                return False
+
         logger.info("PMTiles generation complete")
         return True
-    except subprocess.CalledProcessError as e:
-        logger.error(f"tippecanoe failed: {e.stderr}")
-        return False
     except FileNotFoundError:
         logger.error("tippecanoe not found. Please install it first.")
         return False
@@ -818,7 +1156,7 @@ def run_etl():
             if state_manager.needs_update(project_id, last_updated):
                 projects_to_update.append((project_id, last_updated))
 
-    logger.info(f"{len(projects_to_update)} projects need updating")
+    logger.info("%s projects need updating", len(projects_to_update))
     if state_manager.needs_aggregate_rebuild():
         logger.info("Aggregate artifacts are marked dirty and will be rebuilt")
 
@@ -827,42 +1165,39 @@ def run_etl():
     successful_uploads = 0
     failed_project_updates = 0
     uploads_since_checkpoint = 0
-    for i, (project_id, last_updated) in enumerate(projects_to_update, 1):
-        try:
-            logger.info(
-                f"Fetching project {project_id}... ({i}/{len(projects_to_update)})"
-            )
-            details = api_client.get_project_details(project_id)
-
-            # Upload lean project JSON (only consumer-needed fields)
-            lean = build_lean_project(details)
-            s3_key = f"api/v2/projects/{project_id}"
-            s3_client.put_object(
-                s3_key,
-                json.dumps(lean, separators=(",", ":")).encode("utf-8"),
-                "application/json",
-                cache_control="public, max-age=3600",
-            )
-
-            state_manager.mark_updated(project_id, last_updated)
-            state_manager.mark_aggregate_dirty()
-            updated_projects[project_id] = details
-            successful_uploads += 1
-            uploads_since_checkpoint += 1
-            logger.info(f"Uploaded project {project_id}")
-
-            # Checkpoint early, then every N uploads, so retries resume near the failure.
-            if successful_uploads == 1 or uploads_since_checkpoint >= STATE_CHECKPOINT_INTERVAL:
-                state_manager.save()
-                uploads_since_checkpoint = 0
-                logger.info(
-                    "Checkpointed state after %s project uploads", successful_uploads
+    last_updated_by_id = dict(projects_to_update)
+    with contextlib.closing(
+        iter_completed(
+            lambda project_id: fetch_and_upload_project(s3_client, api_client, project_id),
+            last_updated_by_id,
+            max_workers=PROJECT_FETCH_WORKERS,
+        )
+    ) as completed:
+        for i, (project_id, future) in enumerate(completed, 1):
+            last_updated = last_updated_by_id[project_id]
+            try:
+                details = future.result()
+                state_manager.mark_updated(project_id, last_updated)
+                state_manager.mark_aggregate_dirty()
+                updated_projects[project_id] = details
+                successful_uploads += 1
+                uploads_since_checkpoint += 1
+                logger.debug(
+                    "Uploaded project %s (%s/%s)", project_id, i, len(last_updated_by_id)
                 )
 
-        except requests.RequestException as e:
-            logger.error(f"Failed to fetch project {project_id}: {e}")
-            failed_project_updates += 1
-            continue
+                # Checkpoint early, then every N uploads, so retries resume near the failure.
+                if successful_uploads == 1 or uploads_since_checkpoint >= STATE_CHECKPOINT_INTERVAL:
+                    state_manager.save()
+                    uploads_since_checkpoint = 0
+                    logger.info(
+                        "Checkpointed state after %s project uploads", successful_uploads
+                    )
+
+            except (requests.RequestException, orjson.JSONDecodeError) as e:
+                logger.error("Failed to fetch project %s: %s", project_id, e)
+                failed_project_updates += 1
+                continue
 
     if uploads_since_checkpoint:
         state_manager.save()
@@ -875,8 +1210,8 @@ def run_etl():
 
     try:
         feature_map = load_cached_feature_map(s3_client)
-    except (ValueError, json.JSONDecodeError) as e:
-        logger.warning(f"Could not load cached aggregate GeoJSON: {e}")
+    except ValueError as e:
+        logger.warning("Could not load cached aggregate GeoJSON: %s", e)
         feature_map = {}
 
     cached_feature_count = len(feature_map)
@@ -996,43 +1331,49 @@ def run_etl():
         )
 
     refresh_failures = 0
-    for project_id in sorted(project_ids_to_refresh):
-        try:
-            details = get_project_details_for_rebuild(
+    refreshed_details: dict[int, dict[str, Any]] = {}
+    with contextlib.closing(
+        iter_completed(
+            lambda project_id: get_project_details_for_rebuild(
                 s3_client,
                 api_client,
                 project_id,
                 updated_projects,
                 expected_last_updated=expected_last_updated.get(project_id),
-            )
-            feature = build_feature(details)
-            if feature:
-                feature_map[project_id] = feature
-            else:
-                feature_map.pop(project_id, None)
-
-        except (requests.RequestException, json.JSONDecodeError) as e:
-            status_code = getattr(getattr(e, "response", None), "status_code", None)
-            if status_code in {403, 404}:
-                feature_map.pop(project_id, None)
-                removed = state_manager.remove_projects({project_id})
-                logger.warning(
-                    "Removing project %s from aggregate/state after %s from public API",
-                    project_id,
-                    status_code,
-                )
-                if removed:
-                    s3_client.delete_objects([f"api/v2/projects/{project_id}"])
-                    state_manager.mark_aggregate_dirty()
+            ),
+            project_ids_to_refresh,
+            max_workers=REFRESH_FETCH_WORKERS,
+        )
+    ) as completed:
+        for project_id, future in completed:
+            try:
+                refreshed_details[project_id] = future.result()
+                if len(refreshed_details) >= FEATURE_BATCH_SIZE:
+                    apply_features(feature_map, refreshed_details)
+
+            except (requests.RequestException, orjson.JSONDecodeError) as e:
+                status_code = getattr(getattr(e, "response", None), "status_code", None)
+                if status_code in {403, 404}:
+                    feature_map.pop(project_id, None)
+                    removed = state_manager.remove_projects({project_id})
+                    logger.warning(
+                        "Removing project %s from aggregate/state after %s from public API",
+                        project_id,
+                        status_code,
+                    )
+                    if removed:
+                        s3_client.delete_objects([f"api/v2/projects/{project_id}"])
+                        state_manager.mark_aggregate_dirty()
+                    continue
+                logger.warning("Could not process project %s: %s", project_id, e)
+                refresh_failures += 1
                 continue
-            logger.warning(f"Could not process project {project_id}: {e}")
-            refresh_failures += 1
-            continue
 
-    features = [feature_map[project_id] for project_id in sorted(feature_map)]
+    apply_features(feature_map, refreshed_details)
+    updated_projects.clear()
 
-    feature_collection = {"type": "FeatureCollection", "features": features}
-    logger.info(f"Created FeatureCollection with {len(features)} features")
+    features = [feature_map[project_id] for project_id in sorted(feature_map)]
+    logger.info("Created FeatureCollection with %s features", len(features))
 
     # Build projects summary JSON (no geometries, for dashboard)
     logger.info("Building projects summary JSON...")
@@ -1048,46 +1389,65 @@ def run_etl():
     aggregate_success = False
     with tempfile.TemporaryDirectory() as tmpdir:
         tmpdir_path = Path(tmpdir)
-        geojson_path = tmpdir_path / ALL_PROJECTS_GEOJSON
         pmtiles_path = tmpdir_path / PMTILES_OUTPUT
 
-        # Serialize once, write to disk for tippecanoe, upload compressed to S3
-        geojson_bytes = json.dumps(feature_collection, separators=(",", ":")).encode("utf-8")
-        with open(geojson_path, "wb") as f:
-            f.write(geojson_bytes)
-
-        s3_client.put_object(
-            ALL_PROJECTS_GEOJSON,
-            geojson_bytes,
-            "application/geo+json",
-            cache_control="public, max-age=3600",
-            compress=True,
-        )
-        logger.info(f"Uploaded {ALL_PROJECTS_GEOJSON} ({len(geojson_bytes) / 1024 / 1024:.1f} MB raw)")
-
-        # Upload projects summary (compressed)
-        summary_bytes = json.dumps(summary, separators=(",", ":")).encode("utf-8")
-        s3_client.put_object(
-            PROJECTS_SUMMARY,
-            summary_bytes,
-            "application/json",
-            cache_control="public, max-age=3600",
-            compress=True,
-        )
-        logger.info(f"Uploaded {PROJECTS_SUMMARY}")
+        # Serialize each feature once. The uploaded FeatureCollection is
+        # assembled from these bytes, and tippecanoe reads them as
+        # newline-delimited features.
+        feature_lines = [orjson.dumps(feature) for feature in features]
+        geojson_bytes = encode_feature_collection(feature_lines)
+        summary_bytes = orjson.dumps(summary)
+        # Drop the decoded aggregate so tippecanoe isn't competing with it for RAM
+        del feature_map, features, summary_projects, summary
+
+        # The aggregate JSON uploads are independent of each other and of the
+        # PMTiles build, so run them in the background while tippecanoe works.
+        with ThreadPoolExecutor(max_workers=2) as upload_pool:
+            geojson_upload = upload_pool.submit(
+                s3_client.put_object,
+                ALL_PROJECTS_GEOJSON,
+                geojson_bytes,
+                "application/geo+json",
+                cache_control="public, max-age=3600",
+                compress=True,
+            )
+            summary_upload = upload_pool.submit(
+                s3_client.put_object,
+                PROJECTS_SUMMARY,
+                summary_bytes,
+                "application/json",
+                cache_control="public, max-age=3600",
+                compress=True,
+            )
 
-        # Generate and upload PMTiles (no gzip - PMTiles uses internal compression)
-        if generate_pmtiles(geojson_path, pmtiles_path):
-            with open(pmtiles_path, "rb") as f:
-                pmtiles_data = f.read()
+            # Generate and upload PMTiles (no gzip - PMTiles uses internal compression)
+            pmtiles_uploaded = False
+            if generate_pmtiles(feature_lines, pmtiles_path):
+                s3_client.upload_file(
+                    PMTILES_OUTPUT,
+                    pmtiles_path,
+                    "application/vnd.pmtiles",
+                    cache_control="public, max-age=3600",
+                )
+                logger.info(
+                    "Uploaded %s (%.1f MB)",
+                    PMTILES_OUTPUT,
+                    pmtiles_path.stat().st_size / 1024 / 1024,
+                )
+                pmtiles_uploaded = True
+            else:
+                logger.warning("PMTiles generation failed, skipping upload")
 
-            s3_client.put_object(
-                PMTILES_OUTPUT,
-                pmtiles_data,
-                "application/vnd.pmtiles",
-                cache_control="public, max-age=3600",
+            geojson_upload.result()
+            logger.info(
+                "Uploaded %s (%.1f MB raw)",
+                ALL_PROJECTS_GEOJSON,
+                len(geojson_bytes) / 1024 / 1024,
             )
-            logger.info(f"Uploaded {PMTILES_OUTPUT} ({len(pmtiles_data) / 1024 / 1024:.1f} MB)")
+            summary_upload.result()
+            logger.info("Uploaded %s", PROJECTS_SUMMARY)
+
+        if pmtiles_uploaded:
             if refresh_failures == 0 and failed_project_updates == 0:
                 aggregate_success = True
             else:
@@ -1096,8 +1456,6 @@ def run_etl():
                     failed_project_updates,
                     refresh_failures,
                 )
-        else:
-            logger.warning("PMTiles generation failed, skipping upload")
 
     if aggregate_success:
         state_manager.mark_aggregate_clean(generated_at)
@@ -1114,7 +1472,7 @@ def validate_env():
     missing = [var for var in required if not os.environ.get(var)]
 
     if missing:
-        logger.error(f"Missing required environment variables: {', '.join(missing)}")
+        logger.error("Missing required environment variables: %s", ", ".join(missing))
         sys.exit(1)
 
 
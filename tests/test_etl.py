@@ -1,8 +1,40 @@
+import contextlib
 import gzip
+import hashlib
 import json
+import os
+import stat
+import tempfile
+import threading
+import time
 import unittest
-
-from etl import S3Client, StateManager, build_lean_project, normalize_api_timestamp
+from pathlib import Path
+from unittest import mock
+
+import orjson
+import requests
+from botocore.exceptions import ClientError
+
+from etl import (
+    MULTIPART_CHUNK_SIZE,
+    PAGE_FETCH_WORKERS,
+    HOTApiClient,
+    S3Client,
+    StateManager,
+    apply_features,
+    build_features,
+    build_lean_project,
+    compute_geometry_metrics,
+    encode_feature_collection,
+    generate_pmtiles,
+    iter_completed,
+    normalize_api_timestamp,
+    normalize_imagery,
+)
+
+
+def fake_etag(body):
+    return None if body is None else f'"{hashlib.md5(body).hexdigest()}"'
 
 
 class FakeS3Client:
@@ -14,8 +46,43 @@ class FakeS3Client:
     def get_object(self, key):
         return self.objects.get(key)
 
-    def put_object(self, key, body, content_type, **kwargs):
+    def get_object_with_etag(self, key):
+        data = self.objects.get(key)
+        return data, fake_etag(data)
+
+    def put_object(
+        self, key, body, content_type, if_match=None, if_none_match=None, **kwargs
+    ):
+        stored = self.objects.get(key)
+        if (if_match is not None and if_match != fake_etag(stored)) or (
+            if_none_match == "*" and stored is not None
+        ):
+            raise ClientError(
+                {"Error": {"Code": "PreconditionFailed"}}, "PutObject"
+            )
         self.objects[key] = body
+        return fake_etag(body)
+
+
+class RecordingBotoClient:
+    def __init__(self):
+        self.calls = []
+
+    def put_object(self, **kwargs):
+        self.calls.append(("put_object", kwargs))
+        return {"ETag": '"etag"'}
+
+    def upload_fileobj(self, fileobj, **kwargs):
+        self.calls.append(("upload_fileobj", {"Body": fileobj.read(), **kwargs}))
+
+
+def make_s3_client():
+    """Build an S3Client around a RecordingBotoClient, skipping boto3 setup."""
+    s3_client = S3Client.__new__(S3Client)
+    s3_client.bucket_name = "bucket"
+    s3_client.client = RecordingBotoClient()
+    s3_client._transfer_config = None
+    return s3_client
 
 
 class NormalizeApiTimestampTests(unittest.TestCase):
@@ -47,6 +114,31 @@ class NormalizeApiTimestampTests(unittest.TestCase):
         self.assertIsNone(normalize_api_timestamp(None))
 
 
+class NormalizeImageryTests(unittest.TestCase):
+    def test_classifies_known_providers(self):
+        self.assertEqual(normalize_imagery("Bing"), "Bing")
+        self.assertEqual(normalize_imagery("Esri World Imagery"), "Esri")
+        self.assertEqual(normalize_imagery("tms[22]:https://api.mapbox.com/x"), "Mapbox")
+        self.assertEqual(normalize_imagery("Maxar Vivid"), "Maxar")
+        self.assertEqual(normalize_imagery("OpenAerialMap"), "OAM")
+        self.assertEqual(normalize_imagery("Open Aerial"), "OAM")
+        self.assertEqual(normalize_imagery("CUSTOM"), "Custom")
+
+    def test_earlier_categories_take_priority(self):
+        self.assertEqual(normalize_imagery("esri basemap, bing fallback"), "Bing")
+        self.assertEqual(normalize_imagery("custom maxar layer"), "Maxar")
+
+    def test_dot_in_patterns_does_not_match_newlines(self):
+        self.assertEqual(normalize_imagery("vivid World\nImagery"), "Maxar")
+        self.assertEqual(normalize_imagery("World\nImagery"), "Other")
+        self.assertEqual(normalize_imagery("World Imagery"), "Esri")
+
+    def test_unrecognized_and_missing_values(self):
+        self.assertEqual(normalize_imagery("https://tiles.example.com/{z}/{x}/{y}"), "Other")
+        self.assertEqual(normalize_imagery("  "), "Not specified")
+        self.assertEqual(normalize_imagery(None), "Not specified")
+
+
 class StateManagerTests(unittest.TestCase):
     def test_load_normalizes_project_timestamps(self):
         s3_client = FakeS3Client(
@@ -95,6 +187,99 @@ class StateManagerTests(unittest.TestCase):
             "2020-02-06T03:02:50.248Z",
         )
 
+    def test_save_skips_upload_when_state_is_unchanged(self):
+        s3_client = FakeS3Client()
+        state_manager = StateManager(s3_client)
+        state_manager.mark_updated(100, "2020-02-06T03:02:50.248Z")
+        state_manager.save()
+        del s3_client.objects["state.v3.json"]
+
+        state_manager.save()
+        self.assertNotIn("state.v3.json", s3_client.objects)
+
+        state_manager.mark_updated(101, "2020-02-06T03:02:50.249Z")
+        state_manager.save()
+        self.assertIn("state.v3.json", s3_client.objects)
+
+    def test_save_skips_upload_of_freshly_loaded_state(self):
+        s3_client = FakeS3Client()
+        writer = StateManager(s3_client)
+        writer.mark_updated(100, "2020-02-06T03:02:50.248Z")
+        writer.save()
+
+        reader = StateManager(s3_client)
+        reader.load()
+        s3_client.objects["state.v3.json"] = b"sentinel"
+        reader.save()
+
+        self.assertEqual(s3_client.objects["state.v3.json"], b"sentinel")
+
+    def test_save_merges_state_written_by_a_concurrent_run(self):
+        s3_client = FakeS3Client()
+        seed = StateManager(s3_client)
+        seed.mark_updated(100, "2020-01-01T00:00:00.000Z")
+        seed.save()
+
+        first_run = StateManager(s3_client)
+        first_run.load()
+        second_run = StateManager(s3_client)
+        second_run.load()
+
+        second_run.mark_updated(100, "2021-01-01T00:00:00.000Z")
+        second_run.mark_aggregate_dirty()
+        second_run.save()
+        first_run.mark_updated(101, "2020-06-01T00:00:00.000Z")
+        first_run.save()
+
+        merged = StateManager(s3_client)
+        merged.load()
+        self.assertEqual(
+            merged.project_timestamps,
+            {
+                "100": "2021-01-01T00:00:00.000Z",
+                "101": "2020-06-01T00:00:00.000Z",
+            },
+        )
+        self.assertTrue(merged.aggregate_dirty)
+
+    def test_first_save_does_not_overwrite_state_created_by_another_run(self):
+        s3_client = FakeS3Client()
+        first_run = StateManager(s3_client)
+        first_run.load()
+        second_run = StateManager(s3_client)
+        second_run.load()
+
+        second_run.mark_updated(100, "2021-01-01T00:00:00.000Z")
+        second_run.save()
+        first_run.mark_updated(101, "2020-06-01T00:00:00.000Z")
+        first_run.save()
+
+        merged = StateManager(s3_client)
+        merged.load()
+        self.assertEqual(
+            merged.project_timestamps,
+            {
+                "100": "2021-01-01T00:00:00.000Z",
+                "101": "2020-06-01T00:00:00.000Z",
+            },
+        )
+
+    def test_large_state_writes_stay_conditional(self):
+        s3_client = make_s3_client()
+        state_manager = StateManager(s3_client)
+        state_manager.mark_updated(100, "2020-01-01T00:00:00.000Z")
+
+        # Any state body now exceeds the multipart threshold
+        with mock.patch("etl.MULTIPART_CHUNK_SIZE", 1):
+            state_manager.save()
+            state_manager.mark_updated(101, "2020-01-01T00:00:00.000Z")
+            state_manager.save()
+
+        (first_method, first), (second_method, second) = s3_client.client.calls
+        self.assertEqual((first_method, second_method), ("put_object", "put_object"))
+        self.assertEqual(first["IfNoneMatch"], "*")
+        self.assertEqual(second["IfMatch"], '"etag"')
+
     def test_remove_projects_returns_removed_count(self):
         state_manager = StateManager(FakeS3Client())
         state_manager.project_timestamps = {
@@ -148,6 +333,127 @@ class GzipRoundTripTests(unittest.TestCase):
         self.assertEqual(data, original)
 
 
+class S3ClientPutObjectTests(unittest.TestCase):
+    def test_small_bodies_use_single_put(self):
+        s3_client = make_s3_client()
+
+        s3_client.put_object("key", b"{}", "application/json", compress=True)
+
+        (method, kwargs), = s3_client.client.calls
+        self.assertEqual(method, "put_object")
+        self.assertNotIn("IfMatch", kwargs)
+        self.assertEqual(kwargs["ContentEncoding"], "gzip")
+        self.assertEqual(gzip.decompress(kwargs["Body"]), b"{}")
+
+    def test_conditional_writes_pass_if_match_and_return_etag(self):
+        s3_client = make_s3_client()
+        body = b"x" * MULTIPART_CHUNK_SIZE
+
+        etag = s3_client.put_object("key", body, "application/json", if_match='"old"')
+
+        (method, kwargs), = s3_client.client.calls
+        self.assertEqual(method, "put_object")
+        self.assertEqual(kwargs["IfMatch"], '"old"')
+        self.assertEqual(etag, '"etag"')
+
+    def test_large_bodies_use_managed_multipart_transfer(self):
+        s3_client = make_s3_client()
+        body = b"x" * MULTIPART_CHUNK_SIZE
+
+        s3_client.put_object("key", body, "application/json", cache_control="no-cache")
+
+        (method, kwargs), = s3_client.client.calls
+        self.assertEqual(method, "upload_fileobj")
+        self.assertEqual(kwargs["Body"], body)
+        self.assertEqual(
+            kwargs["ExtraArgs"],
+            {"ContentType": "application/json", "CacheControl": "no-cache"},
+        )
+
+
+class FakePageResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self.content = orjson.dumps(payload or {})
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(response=self)
+
+
+class FakePageSession:
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = []
+
+    def get(self, url, params=None, timeout=None):
+        self.requested.append(params["page"])
+        page = self.pages[params["page"]]
+        if isinstance(page, Exception):
+            raise page
+        return page
+
+
+def project_page(project_id, total_pages):
+    return FakePageResponse(
+        200,
+        {"results": [{"projectId": project_id}], "pagination": {"pages": total_pages}},
+    )
+
+
+class PaginateProjectsTests(unittest.TestCase):
+    def paginate(self, pages):
+        api_client = HOTApiClient.__new__(HOTApiClient)
+        api_client.session = FakePageSession(pages)
+        return [p["projectId"] for p in api_client._paginate_projects()]
+
+    def test_collects_pages_in_order(self):
+        pages = {n: project_page(n, 5) for n in range(1, 6)}
+
+        self.assertEqual(self.paginate(pages), [1, 2, 3, 4, 5])
+
+    def test_skips_bad_request_pages(self):
+        pages = {n: project_page(n, 4) for n in range(1, 5)}
+        pages[1] = FakePageResponse(400)
+        pages[3] = FakePageResponse(400)
+
+        self.assertEqual(self.paginate(pages), [2, 4])
+
+    def test_connection_error_cancels_queued_pages(self):
+        pages = {n: project_page(n, 60) for n in range(1, 61)}
+        second_page_fetched = threading.Event()
+        release_workers = threading.Event()
+
+        def connection_error_on_page_two(url, params=None, timeout=None):
+            session.requested.append(params["page"])
+            if params["page"] == 2:
+                second_page_fetched.set()
+                raise requests.ConnectionError("connection reset")
+            if params["page"] > 2:
+                # Hold the other workers so queued pages are still pending
+                release_workers.wait(timeout=5)
+            return pages[params["page"]]
+
+        api_client = HOTApiClient.__new__(HOTApiClient)
+        session = api_client.session = FakePageSession(pages)
+        session.get = connection_error_on_page_two
+        threading.Timer(0.2, release_workers.set).start()
+
+        with self.assertRaises(requests.ConnectionError):
+            api_client._paginate_projects()
+
+        self.assertTrue(second_page_fetched.is_set())
+        # Page 1, the in-flight batch of workers, and at most one page the
+        # failed worker picked up before the queue was cancelled
+        self.assertLessEqual(len(session.requested), 2 + PAGE_FETCH_WORKERS)
+
+    def test_stops_at_first_server_error(self):
+        pages = {n: project_page(n, 5) for n in range(1, 6)}
+        pages[3] = FakePageResponse(500)
+
+        self.assertEqual(self.paginate(pages), [1, 2])
+
+
 class BuildLeanProjectTests(unittest.TestCase):
     def test_extracts_consumer_fields(self):
         full_details = {
@@ -200,5 +506,168 @@ class BuildLeanProjectTests(unittest.TestCase):
         self.assertEqual(lean["projectInfo"]["shortDescription"], "")
 
 
+class GeometryMetricsTests(unittest.TestCase):
+    def test_computes_area_and_centroid_per_geometry(self):
+        square = {
+            "type": "Polygon",
+            "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]],
+        }
+        multi = {
+            "type": "MultiPolygon",
+            "coordinates": [[[[10, 10], [12, 10], [12, 12], [10, 12], [10, 10]]]],
+        }
+
+        (square_area, square_centroid), (multi_area, multi_centroid) = (
+            compute_geometry_metrics([square, multi])
+        )
+
+        self.assertAlmostEqual(square_area, 12308.78, delta=1)
+        self.assertEqual(square_centroid, (0.5, 0.5))
+        self.assertGreater(multi_area, square_area)
+        self.assertEqual(multi_centroid, (11.0, 11.0))
+
+    def test_invalid_geometry_yields_none(self):
+        self.assertEqual(
+            compute_geometry_metrics([{"type": "Polygon", "coordinates": "bad"}, None]),
+            [(None, None), (None, None)],
+        )
+
+    def test_empty_geometry_does_not_fail_the_batch(self):
+        (empty_area, empty_centroid), (_, point_centroid) = compute_geometry_metrics(
+            [
+                {"type": "MultiPolygon", "coordinates": []},
+                {"type": "Point", "coordinates": [1, 2]},
+            ]
+        )
+
+        self.assertEqual(empty_area, 0.0)
+        self.assertIsNone(empty_centroid)
+        self.assertEqual(point_centroid, (1.0, 2.0))
+
+    def test_build_features_skips_projects_without_aoi(self):
+        features = build_features(
+            [
+                {"projectId": 1},
+                {
+                    "projectId": 2,
+                    "areaOfInterest": {
+                        "type": "Polygon",
+                        "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]],
+                    },
+                },
+            ]
+        )
+
+        self.assertIsNone(features[0])
+        self.assertEqual(features[1]["properties"]["projectId"], 2)
+        self.assertEqual(features[1]["properties"]["centroidLon"], 0.5)
+
+
+    def test_apply_features_updates_map_and_releases_details(self):
+        feature_map = {1: {"cached": True}, 2: {"cached": True}}
+        details_by_id = {
+            1: {},
+            2: {
+                "projectId": 2,
+                "areaOfInterest": {
+                    "type": "Polygon",
+                    "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]],
+                },
+            },
+        }
+
+        apply_features(feature_map, details_by_id)
+
+        self.assertEqual(list(feature_map), [2])
+        self.assertEqual(feature_map[2]["properties"]["projectId"], 2)
+        self.assertEqual(details_by_id, {})
+
+class EncodeFeatureCollectionTests(unittest.TestCase):
+    def test_matches_serializing_the_whole_collection(self):
+        features = [
+            {"type": "Feature", "geometry": None, "properties": {"projectId": 1}},
+            {"type": "Feature", "geometry": None, "properties": {"name": "Ilha de Moçambique"}},
+        ]
+
+        encoded = encode_feature_collection([orjson.dumps(f) for f in features])
+
+        self.assertEqual(
+            encoded, orjson.dumps({"type": "FeatureCollection", "features": features})
+        )
+
+    def test_empty_collection_is_valid_json(self):
+        self.assertEqual(
+            json.loads(encode_feature_collection([])),
+            {"type": "FeatureCollection", "features": []},
+        )
+
+
+class GeneratePmtilesTests(unittest.TestCase):
+    def run_with_fake_tippecanoe(self, script):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            fake = tmpdir_path / "tippecanoe"
+            fake.write_text(script)
+            fake.chmod(fake.stat().st_mode | stat.S_IEXEC)
+            output_path = tmpdir_path / "projects.pmtiles"
+
+            path = f"{tmpdir}{os.pathsep}{os.environ.get('PATH', '')}"
+            with mock.patch.dict(os.environ, {"PATH": path}):
+                ok = generate_pmtiles([b'{"a":1}', b'{"b":2}'], output_path)
+            output = output_path.read_bytes() if output_path.exists() else None
+        return ok, output
+
+    def test_streams_newline_delimited_features_to_stdin(self):
+        # "-o <path>" are the first two arguments
+        ok, output = self.run_with_fake_tippecanoe('#!/bin/sh\ncat > "$2"\n')
+
+        self.assertTrue(ok)
+        self.assertEqual(output, b'{"a":1}\n{"b":2}\n')
+
+    def test_reports_failure_exit_status(self):
+        ok, _ = self.run_with_fake_tippecanoe("#!/bin/sh\necho boom >&2\nexit 1\n")
+
+        self.assertFalse(ok)
+
+
+class IterCompletedTests(unittest.TestCase):
+    def test_yields_each_item_with_its_result(self):
+        results = {
+            item: future.result()
+            for item, future in iter_completed(lambda x: x * 2, [1, 2, 3], max_workers=2)
+        }
+
+        self.assertEqual(results, {1: 2, 2: 4, 3: 6})
+
+    def test_exceptions_surface_on_result(self):
+        def fail(item):
+            raise ValueError(item)
+
+        (item, future), = list(iter_completed(fail, ["bad"], max_workers=1))
+
+        self.assertEqual(item, "bad")
+        with self.assertRaises(ValueError):
+            future.result()
+
+    def test_consumer_error_cancels_queued_calls(self):
+        started = []
+
+        def record(item):
+            started.append(item)
+            time.sleep(0.01)
+            return item
+
+        # Keep a reference, as a propagating traceback would in run_etl
+        completed = iter_completed(record, range(200), max_workers=2)
+        with self.assertRaises(RuntimeError):
+            with contextlib.closing(completed):
+                for _item, _future in completed:
+                    raise RuntimeError("upload failed")
+        time.sleep(0.1)
+
+        # Only calls already picked up by a worker may have run
+        self.assertLessEqual(len(started), 10)
+
+
 if __name__ == "__main__":
     unittest.main()